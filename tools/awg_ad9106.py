@@ -5,6 +5,7 @@ It can issue commands to a AWG AD9106 device and load arbitrary waveforms into i
 This module provided the AWG_AD9106 class that implementat much of the implementation
 and provides a "main" function for stand-alone execution.
 """
+# pylint: disable=too-many-lines
 
 import time
 import sys
@@ -12,9 +13,44 @@ import math
 import csv
 import wave
 import argparse
+import numpy as np
 import serial
 import serial.tools.list_ports
 
+# pandas is optional.  When present, its C-based CSV parser is used as a
+# faster alternative to the csv module for well-formed numeric files.
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+# numba is optional.  When present, a compiled kernel decodes 24-bit WAV
+# samples in one fused pass instead of numpy's multi-temporary reconstruction.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit( cache = True )
+    def _decode_24bit_wav_kernel( raw_bytes, num_channels ):
+        """Decodes packed 24-bit samples into a (frames, channels) int32 matrix.
+        """
+        num_frames = raw_bytes.size // ( num_channels * 3 )
+        decoded = np.empty( ( num_frames, num_channels ), np.int32 )
+        for i in range( num_frames ):
+            for j in range( num_channels ):
+                index = ( i * num_channels + j ) * 3
+                value = np.int32( raw_bytes[index] ) | \
+                        ( np.int32( raw_bytes[index + 1] ) << 8 ) | \
+                        ( np.int32( raw_bytes[index + 2] ) << 16 )
+                if value & 0x800000:
+                    value -= 0x1000000
+                decoded[i, j] = value
+        return decoded
+else:
+    _decode_24bit_wav_kernel = None   # pylint: disable=invalid-name
+
 class AWG_AD9106:   # pylint: disable=invalid-name
     """ Class that issues commands and sends arbitrary data to the AWG based on
     Analog Device's AD9106.
@@ -24,6 +60,9 @@ class AWG_AD9106:   # pylint: disable=invalid-name
     EOL = b'\r\n'
     RW_TIMEOUT = 2
     POST_CMD_DELAY = 0.1
+    ACK_MAX_SIZE = 32
+    ACK_FALLBACK_DELAY = 0.01
+    SERIAL_BUFFER_SIZE = 65536
     POST_CHANNEL_DELAY = 2.0
     POST_OVER_DELAY = 2.0
     OVER_R = b'OVER'
@@ -33,21 +72,46 @@ class AWG_AD9106:   # pylint: disable=invalid-name
     AUTO_DETECT = -1
     CMD_XXX = b'XXX' + EOL
     RSP_XXX_SIZE = 1024
+    Z_BLOCK_VALUES = 64
+    Z_BLOCK_SIZE = 3 + Z_BLOCK_VALUES * 3 + len(EOL)
+    Z_BUFFER_POOL_SIZE = MAX_SRAM_SAMPLES // Z_BLOCK_VALUES
+
+    # Lookup table of every legal SRAM value pre-encoded as 3 ASCII digits,
+    # used when formatting Z-commands.
+    _DIGIT3 = tuple( (f"{value:03d}").encode('utf-8')
+                     for value in range(MAX_SRAM_VALUE + 1) )
 
     def __init__(self,
                  portname: str,
                  generateWriteLog: bool,
-                 printWriteLog: bool):
+                 printWriteLog: bool,
+                 awaitAck: bool = False):
         """Constructor for AWG_AD9106 class
+
+        When awaitAck is True, the pacing delay after each ordinary command is
+        replaced by waiting for the device's response line, which typically
+        arrives much sooner than the fixed delay.  Only enable this for
+        firmware that is known to respond to every command.
         """
         self._ser = None
         if portname is not None:
             self._ser   = serial.Serial(port = portname,\
                                         timeout = AWG_AD9106.RW_TIMEOUT,
                                         write_timeout = AWG_AD9106.RW_TIMEOUT)
+            # Enlarge the driver buffers where the platform supports it
+            # (Windows) so batched writes become fewer, larger USB transfers.
+            if hasattr( self._ser, 'set_buffer_size' ):
+                self._ser.set_buffer_size( rx_size = AWG_AD9106.SERIAL_BUFFER_SIZE,
+                                           tx_size = AWG_AD9106.SERIAL_BUFFER_SIZE )
         self._printWriteLog = printWriteLog
         self._generateWriteLog = generateWriteLog
+        self._awaitAck = awaitAck
+        # When nothing consumes the writes (no device, no log, no echo),
+        # write() can skip the per-line work entirely.
+        self._isActive = printWriteLog or generateWriteLog or self._ser is not None
         self._writeLog = bytearray()
+        self._zCommandPool = []
+        self._zCommandsIssued = []
 
         self._needsFinalOver = False
 
@@ -69,22 +133,101 @@ class AWG_AD9106:   # pylint: disable=invalid-name
         If a list item contains newlines or carriage returns, the item is split
         into multiple commands.
         """
+        originalLines = lines if isinstance( lines, list ) else []
         lines = AWG_AD9106._convertCommandsToListOfBytes(lines)
 
+        # The conversion above copied everything, so Z-command buffers that
+        # _buildZCommandBuffer issued can be reclaimed for the next SRAM load.
+        self._reclaimZCommandBuffers( originalLines )
+
+        # Consecutive ordinary commands are coalesced into a single serial
+        # write with one pacing delay.  OVER, XXX, CHANNEL, and Z commands
+        # need individual handling, so they flush the batch first.
+        batchedLines = []
         for line in lines:
             if line == AWG_AD9106.OVER_W:
+                self._flushBatchedLines( batchedLines )
                 self.sendOverWaitForOver()
-            else:
-                if line.startswith( b'Z' ):
-                    self._needsFinalOver = True
-                self._writeHandler( line )
-                if line == AWG_AD9106.CMD_XXX:
-                    print( self.read( AWG_AD9106.RSP_XXX_SIZE ).decode('utf-8') )
-                if self._ser is not None:
-                    if line.startswith( b'CHANNEL' ):
-                        time.sleep(AWG_AD9106.POST_CHANNEL_DELAY)
-                    else:
-                        time.sleep(AWG_AD9106.POST_CMD_DELAY)
+                continue
+
+            if line.startswith( b'Z' ):
+                self._needsFinalOver = True
+            if not self._isActive:
+                continue
+
+            if line != AWG_AD9106.CMD_XXX and \
+               not line.startswith( b'CHANNEL' ) and \
+               not line.startswith( b'Z' ):
+                batchedLines.append( line )
+                continue
+
+            self._flushBatchedLines( batchedLines )
+            self._writeHandler( line )
+            if line == AWG_AD9106.CMD_XXX:
+                print( self.read( AWG_AD9106.RSP_XXX_SIZE ).decode('utf-8') )
+            if self._ser is not None:
+                if line.startswith( b'CHANNEL' ):
+                    time.sleep(AWG_AD9106.POST_CHANNEL_DELAY)
+                else:
+                    self._waitAfterCommand()
+
+        self._flushBatchedLines( batchedLines )
+
+    def _reclaimZCommandBuffers(self,
+                                lines: []) -> None:
+        """Returns written Z-command buffers to the reuse pool.
+
+        Only buffers that _buildZCommandBuffer issued are pooled, and each at
+        most once, so re-sending the same list or passing caller-owned buffers
+        that merely resemble Z-commands can never corrupt later blocks.
+        """
+        for line in lines:
+            if not isinstance( line, bytearray ):
+                continue
+            for index, issued in enumerate( self._zCommandsIssued ):
+                if issued is line:
+                    del self._zCommandsIssued[ index ]
+                    if len( self._zCommandPool ) < AWG_AD9106.Z_BUFFER_POOL_SIZE:
+                        self._zCommandPool.append( line )
+                    break
+
+    def _waitAfterCommand(self,
+                          ackCount: int = 1) -> None:
+        """Paces the command flow after ordinary commands are written.
+
+        By default this is a single fixed delay.  When awaitAck is enabled, it
+        instead drains one response line per written command, so the wait ends
+        as soon as the device has answered, falling back to a short delay if a
+        response does not show up before the read timeout.  Callers must
+        ensure a device is connected.
+        """
+        if not self._awaitAck:
+            time.sleep(AWG_AD9106.POST_CMD_DELAY)
+            return
+
+        for _ in range( 0, ackCount ):
+            ack = self._ser.read_until( AWG_AD9106.EOL, AWG_AD9106.ACK_MAX_SIZE )
+            if len( ack ) == 0:
+                time.sleep(AWG_AD9106.ACK_FALLBACK_DELAY)
+                break
+
+    def _flushBatchedLines(self,
+                           batchedLines: [bytes]) -> None:
+        """Writes a run of batched ordinary commands, then empties the run.
+
+        The echo and write-log still see every command individually; only the
+        device write and its pacing delay are amortized across the run.
+        """
+        if len( batchedLines ) == 0:
+            return
+
+        for line in batchedLines:
+            self._logHandler( line )
+        if self._ser is not None:
+            self._ser.write( b''.join( batchedLines ) )
+            self._waitAfterCommand( len( batchedLines ) )
+
+        batchedLines.clear()
 
     def read(self,
              max_bytes: int) -> bytearray:
@@ -99,6 +242,11 @@ class AWG_AD9106:   # pylint: disable=invalid-name
         """
         self._needsFinalOver = False
         self._writeHandler( AWG_AD9106.OVER_W )
+        if self._ser is not None:
+            # An OVER exchange is a transaction boundary; make sure everything
+            # written so far has actually left the host before awaiting the
+            # device's reply.
+            self._ser.flush()
         dataRead = self.read(len( AWG_AD9106.OVER_R ))
         if dataRead != AWG_AD9106.OVER_R and self._ser is not None:
             raise TimeoutError( "Did not receive " + str(AWG_AD9106.OVER_R) + \
@@ -108,8 +256,13 @@ class AWG_AD9106:   # pylint: disable=invalid-name
 
     def getWriteLog(self) -> bytearray:
         """Retrieves the write-log of commands written to the device.
-        
+
         This depends on generateWriteLog being set to True when the constructor is called.
+
+        The log is backed by a single bytearray that grows geometrically as
+        lines are appended, and it is returned here without copying, so even
+        multi-megabyte captures cost linear time end to end.  Callers should
+        treat the returned buffer as read-only.
         """
         return self._writeLog
 
@@ -176,78 +329,127 @@ class AWG_AD9106:   # pylint: disable=invalid-name
                 self._maxRowsToWrite = min( maxRowsToWrite, AWG_AD9106.MAX_SRAM_SAMPLES )
 
     def loadNumbersFromCSV( self,
-                            filename: str ) -> [int]:
-        """Loads and processes CSV file numbers, returns a list SRAM integer values.
+                            filename: str ) -> np.ndarray:
+        """Loads and processes CSV file numbers, returns an int16 array of SRAM values.
+
+        Memory stays bounded regardless of the file size: both reader paths
+        stop after maxRowsToRead rows (at most the 4096-sample SRAM size), so
+        arbitrarily large CSV files are never held in memory whole.
         """
-        # pylint: disable=too-many-branches
         CSV_SNIFF_LENGTH = 16384
 
-        finalOutput = []
-
         with open(filename, newline='', encoding='utf-8-sig') as csvfile:
-            # Sniff the CSV for its dialect of CSV format
-            dialectSniffed = csv.Sniffer().sniff(csvfile.read(CSV_SNIFF_LENGTH), delimiters=',')
+            # Read the sniffing sample once; it serves both the dialect and
+            # header detection below.
+            sniffSample = csvfile.read(CSV_SNIFF_LENGTH)
             csvfile.seek(0)
 
+            # Determine the dialect of CSV format.  Unquoted comma-separated
+            # data is common and unambiguous, so it skips the slow sniffer.
+            if ',' in sniffSample and '"' not in sniffSample and "'" not in sniffSample:
+                dialectSniffed = csv.excel
+            else:
+                dialectSniffed = csv.Sniffer().sniff(sniffSample, delimiters=',')
+
             hasHeader = self._hasCsvHeader
 
             if hasHeader == AWG_AD9106.AUTO_DETECT:
                 # Auto-detect whether a header row is present
-                hasHeader = csv.Sniffer().has_header(csvfile.read(CSV_SNIFF_LENGTH))
+                hasHeader = csv.Sniffer().has_header(sniffSample)
                 if self._doesPrint:
                     print(  "Auto-detecting CSV header row... " + \
                             ( "detected." if hasHeader else "not detected." ) )
-                csvfile.seek(0)
             else:
                 # Convert to proper boolean
                 hasHeader = hasHeader > 0
 
-            # Figure out the max number of columns in the CSV file
-            reader = csv.reader(csvfile, dialectSniffed)
-            maxColumns = 0
-            skipHeader = hasHeader
-            for row in reader:
-                if skipHeader:
-                    skipHeader = False
-                    continue
-                maxColumns = max( maxColumns, len(row) )
-            columns = []
-            for i in range(0, maxColumns):
-                columns.append([])
-
-            # Read the values from the CSV
-            # Transpose the rows and columns, handle short rows,
-            # handle non-numbers and non-finite numbers
-            csvfile.seek(0)
-            reader = csv.reader(csvfile, dialectSniffed)
-            skipHeader = hasHeader
-            rowCount = 0
-            for row in reader:
-                if skipHeader:
-                    skipHeader = False
-                    continue
-                if rowCount < self._startingRowToRead :
-                    rowCount += 1
-                    continue
-                rowCount += 1
-                if rowCount > self._startingRowToRead + self._maxRowsToRead:
-                    break
-                for i in range(0, maxColumns):
-                    if i >= len(row):
-                        columns[i].append(0.0)
-                    else:
-                        columns[i].append(AWG_AD9106._safeConvertToFloat(row[i]))
+            columns = None
+            if pandas is not None:
+                columns = self._readCsvColumnsWithPandas( filename, dialectSniffed, hasHeader )
+            if columns is None:
+                columns = self._readCsvColumnsWithCsvModule( csvfile, dialectSniffed, hasHeader )
 
-            finalOutput = self._weightedAverageChannels( columns, self._columnRanges )
-            finalOutput = self._padRowsToWrite( finalOutput )
-            finalOutput = self._applyScaling( finalOutput )
-            finalOutput = self._normalizedValuesToRegisterValues( finalOutput )
+        finalOutput = self._weightedAverageChannels( columns, self._columnRanges )
+        finalOutput = self._padRowsToWrite( finalOutput )
+        finalOutput = self._applyScaling( finalOutput )
+        finalOutput = self._normalizedValuesToRegisterValues( finalOutput )
 
         return finalOutput
 
+    def _readCsvColumnsWithPandas( self,
+                                   filename: str,
+                                   dialect,
+                                   hasHeader: bool ) -> [[float]]:
+        """Reads CSV columns using pandas' C parser (the fast path).
+
+        Returns a list of columns, or None if the file needs the more tolerant
+        csv-module path (e.g. rows with differing numbers of cells).
+        """
+        try:
+            frame = pandas.read_csv( filename,
+                                     sep = dialect.delimiter,
+                                     header = None,
+                                     skiprows = ( 1 if hasHeader else 0 ) + \
+                                                self._startingRowToRead,
+                                     nrows = self._maxRowsToRead,
+                                     # Blank lines must stay as rows of 0.0,
+                                     # matching the csv-module path, not be
+                                     # silently dropped.
+                                     skip_blank_lines = False,
+                                     encoding = 'utf-8-sig' )
+        except ( pandas.errors.ParserError, pandas.errors.EmptyDataError ):
+            return None
+
+        # Convert non-numbers and non-finite numbers to 0.0, like
+        # _safeConvertToFloat does on the csv-module path.
+        frame  = frame.apply( pandas.to_numeric, errors = 'coerce' )
+        matrix = np.nan_to_num( frame.to_numpy( dtype = float ),
+                                nan = 0.0, posinf = 0.0, neginf = 0.0 )
+
+        return [ matrix[ :, j ] for j in range( matrix.shape[1] ) ]
+
+    def _readCsvColumnsWithCsvModule( self,
+                                      csvfile,
+                                      dialect,
+                                      hasHeader: bool ) -> [[float]]:
+        """Reads CSV columns using the csv module (the tolerant fallback path).
+        """
+        # Read the values from the CSV in a single pass.
+        # Transpose the rows and columns, handle short rows,
+        # handle non-numbers and non-finite numbers.
+        # Column lists are grown on demand when a wider row appears,
+        # back-filling 0.0 so all the columns stay the same length.
+        csvfile.seek(0)
+        reader = csv.reader(csvfile, dialect)
+        columns = []
+        skipHeader = hasHeader
+        rowCount = 0
+        rowsStored = 0
+        for row in reader:
+            if skipHeader:
+                skipHeader = False
+                continue
+            if rowCount < self._startingRowToRead :
+                rowCount += 1
+                continue
+            rowCount += 1
+            if rowCount > self._startingRowToRead + self._maxRowsToRead:
+                break
+            if len(row) > len(columns):
+                columns.extend( [ [0.0] * rowsStored
+                                  for _ in range( len(row) - len(columns) ) ] )
+            for i, column in enumerate( columns ):
+                if i >= len(row):
+                    column.append(0.0)
+                else:
+                    column.append(AWG_AD9106._safeConvertToFloat(row[i]))
+            rowsStored += 1
+
+        return columns
+
     def loadNumbersFromWAV( self,
-                            filename: str ) -> [float]:
-        """Loads and processes WAV file data, returns a list SRAM integer values.
+                            filename: str ) -> np.ndarray:
+        """Loads and processes WAV file data, returns an int16 array of SRAM values.
         """
         finalOutput = []
 
@@ -262,7 +464,10 @@ class AWG_AD9106:   # pylint: disable=invalid-name
 
             numChannels = wav.getnchannels()
             sampleBytesWidth = wav.getsampwidth()
-            frameBytes = wav.readframes( AWG_AD9106.MAX_SRAM_SAMPLES + self._startingRowToRead )
+            # Seek straight to the first requested frame instead of reading
+            # and discarding the skipped ones, then read only what is needed.
+            wav.setpos( min( self._startingRowToRead, wav.getnframes() ) )
+            frameBytes = wav.readframes( self._maxRowsToRead )
 
             channels = []
             for _ in range(0, numChannels):
@@ -270,19 +475,11 @@ class AWG_AD9106:   # pylint: disable=invalid-name
             if sampleBytesWidth == 1:
                 # Format is unsigned 8-bit values where 0x80 is 0.0.
                 DIVISOR = AWG_AD9106.MAX_SRAM_VALUE / 4.0
-                j = 0
-                rowCount = 0
-                for value in frameBytes:
-
-                    if rowCount < self._startingRowToRead:
-                        rowCount += 1
-                        continue
-                    rowCount += 1
-                    if rowCount > self._startingRowToRead + self._maxRowsToRead:
-                        break
-
-                    channels[j].append( int(value) / DIVISOR - 1.0 )
-                    j = (j + 1) % numChannels
+                numSamples = len( frameBytes ) // numChannels * numChannels
+                values = np.frombuffer( frameBytes, dtype = np.uint8, count = numSamples )
+                values = values.reshape( -1, numChannels ) / DIVISOR - 1.0
+                for j in range( 0, numChannels ):
+                    channels[j] = values[ :, j ]
             else:
                 # Format is signed multiple-bit values where 0x00..00 is 0.0.
                 channels = self._loadNumbersFromMultiByteWAV( channels,
@@ -304,54 +501,110 @@ class AWG_AD9106:   # pylint: disable=invalid-name
                                       sampleBytesWidth: int,
                                       numChannels: int ) -> [[float]]:
         """Loads numbers from non-8-bit WAV files (i.e., loads signed integer values).
-        
+
         Returns a list of lists of floats that are normalized to the -1.0 to 1.0 range.
         """
-        # pylint: disable=consider-using-enumerate
-        currentValue = 0
-        isNegative = False
         zeroOffset = 1 << ( sampleBytesWidth * 8 - 1 )
-        rowCount = 0
 
-        for i in range(0, len(frameBytes)):
-            channel = ( i // sampleBytesWidth ) % numChannels
-            byteIndex   = i % sampleBytesWidth
-            isFirstByte = byteIndex == 0
-            isLastByte  = byteIndex == (sampleBytesWidth - 1)
-
-            if rowCount < self._startingRowToRead:
-                if isLastByte and channel == numChannels - 1:
-                    rowCount += 1
-                continue
-            if isLastByte and channel == numChannels - 1:
-                rowCount += 1
-            if rowCount > self._startingRowToRead + self._maxRowsToRead:
-                break
+        # Dividing by a power of two is exact, so the divide can be an
+        # equivalent (and cheaper) multiply.
+        decoderName = AWG_AD9106._WAV_DECODER_NAMES.get( sampleBytesWidth )
+        if decoderName is not None:
+            values = getattr( self, decoderName )( frameBytes, numChannels )
+        else:
+            values = AWG_AD9106._decodeGenericWAV( frameBytes, numChannels,
+                                                   sampleBytesWidth )
+        values = values * ( 1.0 / zeroOffset )
 
-            if isFirstByte:
-                currentValue = frameBytes[i] & 0xFF
-            elif isLastByte:
-                currentValue |= ( frameBytes[i] & 0x7F ) << (8 * byteIndex)
-                isNegative   = frameBytes[i] & 0x80 != 0
-                if isNegative:
-                    currentValue -= zeroOffset
-                channels[channel].append( currentValue / zeroOffset )
-            else:
-                currentValue |= frameBytes[i] << (8 * byteIndex)
+        for j in range( 0, numChannels ):
+            channels[j] = values[ :, j ]
 
         return channels
 
+    @staticmethod
+    def _decode16BitWAV( frameBytes: bytes,
+                         numChannels: int ) -> np.ndarray:
+        """Decodes 16-bit WAV frames into a (frames, channels) integer matrix.
+        """
+        numSamples = len( frameBytes ) // 2 // numChannels * numChannels
+        return np.frombuffer( frameBytes, dtype = '<i2', count = numSamples ) \
+                 .reshape( -1, numChannels ).astype( np.int32 )
+
+    @staticmethod
+    def _decode32BitWAV( frameBytes: bytes,
+                         numChannels: int ) -> np.ndarray:
+        """Decodes 32-bit WAV frames into a (frames, channels) integer matrix.
+        """
+        numSamples = len( frameBytes ) // 4 // numChannels * numChannels
+        return np.frombuffer( frameBytes, dtype = '<i4', count = numSamples ) \
+                 .reshape( -1, numChannels ).astype( np.int32 )
+
+    @staticmethod
+    def _decode24BitWAV( frameBytes: bytes,
+                         numChannels: int ) -> np.ndarray:
+        """Decodes 24-bit WAV frames into a (frames, channels) integer matrix.
+
+        24-bit samples have no native dtype, so each little-endian byte triple
+        is reassembled into a sign-extended 32-bit integer with column shifts,
+        or by the fused numba kernel when numba is installed.
+        """
+        numBytes = len( frameBytes ) // ( 3 * numChannels ) * ( 3 * numChannels )
+        rawBytes = np.frombuffer( frameBytes, dtype = np.uint8, count = numBytes )
+
+        if _decode_24bit_wav_kernel is not None:
+            return _decode_24bit_wav_kernel( rawBytes, numChannels )
+
+        rawBytes = rawBytes.reshape( -1, numChannels, 3 )
+        return rawBytes[ ..., 0 ].astype( np.int32 ) | \
+               ( rawBytes[ ..., 1 ].astype( np.int32 ) << 8 ) | \
+               ( rawBytes[ ..., 2 ].astype( np.int8 ).astype( np.int32 ) << 16 )
+
+    @staticmethod
+    def _decodeGenericWAV( frameBytes: bytes,
+                           numChannels: int,
+                           sampleBytesWidth: int ) -> np.ndarray:
+        """Decodes WAV frames of any sample width into a (frames, channels) matrix.
+
+        The wave module accepts arbitrary sample widths, so widths without a
+        specialized decoder are reassembled here: each little-endian byte
+        group is accumulated column by column, with the top byte sign-extended.
+        """
+        frameWidth = sampleBytesWidth * numChannels
+        numBytes = len( frameBytes ) // frameWidth * frameWidth
+        rawBytes = np.frombuffer( frameBytes, dtype = np.uint8, count = numBytes ) \
+                     .reshape( -1, numChannels, sampleBytesWidth )
+
+        values = rawBytes[ ..., sampleBytesWidth - 1 ].astype( np.int8 ).astype( np.int64 ) \
+                 << ( 8 * ( sampleBytesWidth - 1 ) )
+        for byteIndex in range( sampleBytesWidth - 1 ):
+            values += rawBytes[ ..., byteIndex ].astype( np.int64 ) << ( 8 * byteIndex )
+        return values
+
+    # Dispatch of sample byte width to its specialized decoder above; widths
+    # not listed here fall back to _decodeGenericWAV.
+    _WAV_DECODER_NAMES = { 2: '_decode16BitWAV',
+                           3: '_decode24BitWAV',
+                           4: '_decode32BitWAV' }
+
 
     def convertNumbersToZCommands(self,
                                   valuesInput: [float]) -> [bytearray]:
         """Given a list of numbers, convert them to a series of Z-commands.
-        
+
         Z-commands are used to load arbitrary data into the SRAM.
-        """
-        #pylint: disable=consider-using-enumerate
+        The returned buffers may be reused by the next call to this method once
+        they have been passed to write(), so use them before generating more.
 
+        The 3-digit decimal ASCII framing is fixed by the device firmware;
+        there is no binary SRAM-load alternative.  The encode is a single
+        table-driven join rather than per-sample formatting, so the cost of
+        the ASCII form is one pass over the values.
+        """
         z_commandsOutput = []
-        didClipNumbers = False
+
+        # Buffers issued by an earlier call that were never written are
+        # forgotten here so they cannot pile up; they simply are not pooled.
+        self._zCommandsIssued = []
 
         if len(valuesInput) > AWG_AD9106.MAX_SRAM_SAMPLES:
             if self._doesPrint:
@@ -360,21 +613,27 @@ class AWG_AD9106:   # pylint: disable=invalid-name
                        AWG_AD9106.MAX_SRAM_SAMPLES + " values" )
             valuesInput = valuesInput[0:AWG_AD9106.MAX_SRAM_SAMPLES]
 
-        for i in range( 0, len( valuesInput ) ):
-            if i % 64 == 0:
-                z_command = bytearray()
-                z_command.extend(b'Z')
-                z_command.extend( (f"{i // 64:02d}").encode('utf-8') )
-
-            # Restrict values to integers in the range of [0, MAX_SRAM_VALUE]
-            value = max(0, min( AWG_AD9106.MAX_SRAM_VALUE, int(valuesInput[i]) ) )
-
-            if value != int( valuesInput[i] ):
-                didClipNumbers = True
-            z_command.extend( (f"{value:03d}").encode('utf-8') )
-            if i % 64 == 63 or i == len( valuesInput ) - 1:
-                z_command.extend(b'\r\n')
-                z_commandsOutput.append(z_command)
+        # Restrict values to integers in the range of [0, MAX_SRAM_VALUE] and
+        # detect any clipping, all in one vectorized pass.  Integer input —
+        # e.g. the int16 arrays the load methods produce — is used as-is
+        # without a converting copy.
+        rawValues      = np.asarray( valuesInput )
+        if rawValues.dtype.kind != 'i':
+            rawValues  = rawValues.astype( np.int64 )
+        clippedValues  = np.clip( rawValues, 0, AWG_AD9106.MAX_SRAM_VALUE )
+        didClipNumbers = bool( ( rawValues != clippedValues ).any() )
+        values         = clippedValues.tolist()
+
+        # Format every sample into one contiguous digit stream with a single
+        # join, then carve the per-block payloads out of it as slices.
+        digitStream = b''.join( map( AWG_AD9106._DIGIT3.__getitem__, values ) )
+        blockDigitsSize = AWG_AD9106.Z_BLOCK_VALUES * 3
+        numBlocks = ( len( values ) + AWG_AD9106.Z_BLOCK_VALUES - 1 ) // \
+                    AWG_AD9106.Z_BLOCK_VALUES
+        for blockIndex in range( 0, numBlocks ):
+            blockDigits = digitStream[ blockIndex * blockDigitsSize :
+                                       ( blockIndex + 1 ) * blockDigitsSize ]
+            z_commandsOutput.append( self._buildZCommandBuffer( blockIndex, blockDigits ) )
         if self._doesPrint and didClipNumbers:
             print( "WARNING: some values were out-of-range and clipped to 0 and/or "
                    "{AWG_AD9106.MAX_SRAM_VALUE}." )
@@ -383,6 +642,31 @@ class AWG_AD9106:   # pylint: disable=invalid-name
 
         return z_commandsOutput
 
+    def _buildZCommandBuffer( self,
+                              blockIndex: int,
+                              blockDigits: bytes ) -> bytearray:
+        """Assembles a single Z-command, reusing a pooled buffer when possible.
+
+        Full-size blocks are built by slice-assignment into a bytearray from
+        the pool that write() maintains, avoiding a fresh allocation per block.
+        """
+        prefix = b'Z' + (f"{blockIndex:02d}").encode('utf-8')
+
+        if len( blockDigits ) == AWG_AD9106.Z_BLOCK_VALUES * 3:
+            if len( self._zCommandPool ) > 0:
+                z_command = self._zCommandPool.pop()
+                z_command[ 0 : 3 ] = prefix
+                z_command[ 3 : 3 + len( blockDigits ) ] = blockDigits
+                z_command[ 3 + len( blockDigits ) : ] = AWG_AD9106.EOL
+            else:
+                z_command = bytearray( prefix + blockDigits + AWG_AD9106.EOL )
+            # Remember the buffer so write() can tell it apart from
+            # caller-owned data and reclaim it exactly once.
+            self._zCommandsIssued.append( z_command )
+            return z_command
+
+        return bytearray( prefix + blockDigits + AWG_AD9106.EOL )
+
     @staticmethod
     def _convertCommandsToListOfBytes(lines: []) ->[bytearray]:
         """Converts a list of "commands" into a list of bytearray of true commands.
@@ -404,9 +688,7 @@ class AWG_AD9106:   # pylint: disable=invalid-name
             else:
                 raise TypeError( "Unhandled line with type " + type(line) + " was encountered." )
 
-            line = line.replace(b'\r', b'\n')
-
-            tempList = line.split(b'\n')
+            tempList = line.splitlines()
             for tempItem in tempList:
                 if len(tempItem) > 0:
                     bytesList.append( tempItem + AWG_AD9106.EOL )
@@ -416,16 +698,23 @@ class AWG_AD9106:   # pylint: disable=invalid-name
     def _writeHandler(self,
                       line: bytearray) -> None:
         """Low-level handler for writing to the device.
-        
+
         This hands the device write itself as well as the write-log and printing to the screen.
         """
+        self._logHandler( line )
+        if self._ser is not None:
+            self._ser.write( line )
+
+    def _logHandler(self,
+                    line: bytearray) -> None:
+        """Handles the write-log and printing commands to the screen.
+        """
         if self._printWriteLog:
-            # Convert to platform's native screen output.
-            print( line.decode().replace('\n', '').replace('\r', '') )
+            # Convert to platform's native screen output, dropping the EOL
+            # bytes in a single translate pass.
+            print( line.translate( None, b'\r\n' ).decode() )
         if self._generateWriteLog:
             self._writeLog.extend( line )
-        if self._ser is not None:
-            self._ser.write( line )
 
     @staticmethod
     def _safeConvertToFloat( string: str ) -> float:
@@ -451,8 +740,12 @@ class AWG_AD9106:   # pylint: disable=invalid-name
         The channels input a list of lists of floats.
         The channelRanges is a list of lists each containing 2 floats that are the
         expected min and max values.  It uses the same indices as channels.
+
+        Every load path delivers dense, equal-length channels here (ragged CSV
+        rows are zero back-filled by the reader), so the whole reduction runs
+        as one matrix product with no per-row Python loop.
         """
-        #pylint: disable=consider-using-enumerate
+        # pylint: disable=too-many-locals
 
         maxChannelLength = 0
         for channel in channels:
@@ -482,20 +775,34 @@ class AWG_AD9106:   # pylint: disable=invalid-name
         # Pad out channelRanges with None if needed.
         channelRanges = AWG_AD9106._copyListAndForceLength( channelRanges, len( channels ), None )
 
-        finalOutput = []
-        for i in range(0, maxChannelLength):
-            weightedAverage = 0
-            for j in range(0, len(channels)):
-                # Safely get the weight and value
-                weight = float( columnWeights[j] )
-                value  = 0.0 if j >= len(channels) else channels[j][i]
-                value  = AWG_AD9106._normalizeValue( value, channelRanges[j] )
-                weightedAverage += weight * value
-            if weightTotal > 0.0:
-                weightedAverage /= weightTotal
-            else:
-                weightedAverage = 0.0
-            finalOutput.append(weightedAverage)
+        # Stack the channels into a (numChannels, maxChannelLength) matrix,
+        # zero-filling any short channels.
+        DEFAULT_RANGE = [ -1.0, 1.0 ]
+        matrix = np.zeros( ( len( channels ), maxChannelLength ) )
+        for j, channel in enumerate( channels ):
+            matrix[ j, 0 : len( channel ) ] = channel
+
+        # Normalize every channel to the -1.0 to 1.0 range in one vectorized
+        # pass, using per-channel min/max values from channelRanges.
+        rangeLows, rangeHighs = AWG_AD9106._normalizeRanges( channelRanges )
+        rangeWidths = rangeHighs - rangeLows
+        rangeScales = np.divide( 2.0, rangeWidths,
+                                 out = np.zeros_like( rangeWidths ),
+                                 where = rangeWidths != 0.0 )
+        # Fold each range into per-channel scale/offset arrays so the whole
+        # normalization is one in-place multiply and add, with no temporaries.
+        rangeOffsets = -rangeLows * rangeScales - 1.0
+        matrix *= rangeScales[ :, None ]
+        matrix += rangeOffsets[ :, None ]
+        matrix[ rangeWidths == 0.0, : ] = 0.0
+        np.clip( matrix, DEFAULT_RANGE[0], DEFAULT_RANGE[1], out = matrix )
+
+        # The weighted average collapses to a single matrix-vector product.
+        finalOutput = np.asarray( columnWeights, dtype = float ) @ matrix
+        if weightTotal > 0.0:
+            finalOutput /= weightTotal
+        else:
+            finalOutput = np.zeros( maxChannelLength )
 
         return finalOutput
 
@@ -504,87 +811,91 @@ class AWG_AD9106:   # pylint: disable=invalid-name
                                  length: int,
                                  fillValue) -> []:
         """Copies a list and forces it to have the specified length.
-        
+
         This is done via truncation or padding with the fillValue.
+        An input list that already has the correct length is returned as-is
+        with no copy, so callers must treat the result as read-only.
         """
-        listOutput = []
+        if listInput is not None and len(listInput) == length:
+            return listInput
 
-        if listInput is not None:
-            listOutput = listInput.copy()
+        listOutput = [] if listInput is None else listInput[:length]
         if len(listOutput) < length:
             listOutput.extend( [ fillValue ] * (length - len(listOutput) ) )
-        listOutput = listOutput[:length]
 
         return listOutput
 
 
     @staticmethod
-    def _normalizeValue( value: float,
-                         channelRange: [float] ) -> float:
-        """Normalizes a single value to the range of -1.0 to 1.0.
-        
-        channelRange is a list containing 2 floats that are the expected min and max
-        for the input value.  This is used to convert value to the range of -1.0 to 1.0.
+    def _normalizeRanges( channelRanges: [[float]] ) -> ( np.ndarray, np.ndarray ):
+        """Precomputes ordered low/high arrays from a list of channel ranges.
+
+        Each channelRange is a list containing 2 floats that are the expected min
+        and max for that channel's values.  Invalid or missing ranges become the
+        default -1.0 to 1.0, and reversed ranges are put back in order here, once,
+        rather than per value in the normalization loop.
         """
         DEFAULT_RANGE = [ -1.0, 1.0 ]
 
-        if channelRange is None or not isinstance(channelRange, list) or len(channelRange) < 2:
-            channelRange = DEFAULT_RANGE
-
-        if channelRange[0] > channelRange[1]:
-            tempRangeValue  = channelRange[0]
-            channelRange[0] = channelRange[1]
-            channelRange[1] = tempRangeValue
+        rangeLows  = np.empty( len( channelRanges ) )
+        rangeHighs = np.empty( len( channelRanges ) )
+        for j, channelRange in enumerate( channelRanges ):
+            if channelRange is None or not isinstance( channelRange, list ) or \
+               len( channelRange ) < 2:
+                channelRange = DEFAULT_RANGE
+            rangeLows[j]  = min( channelRange[0], channelRange[1] )
+            rangeHighs[j] = max( channelRange[0], channelRange[1] )
 
-        channelWidth = channelRange[1] - channelRange[0]
-        if channelWidth == 0.0:
-            return 0.0
-        value -= channelRange[0]
-        value = value * 2.0 / channelWidth
-        value += DEFAULT_RANGE[0]
-        return max( DEFAULT_RANGE[0], min( DEFAULT_RANGE[1], value ) )
+        return rangeLows, rangeHighs
 
     def _applyScaling( self,
                        normValues: [float] ) -> [float]:
         """Applies auto-scaling and/or the scaling multiplier to the list of values.
+
+        Accepts either a list or a numpy array, returns a numpy array.
         """
-        minValue = min( normValues )
-        maxValue = max( normValues )
+        normValues = np.asarray( normValues, dtype = float )
+        multiplier = self._scaleMultiplier
 
         if self._doScaleAuto:
-            autoMultiplier = 1.0
+            minValue = normValues.min()
+            maxValue = normValues.max()
             if minValue != 0 and maxValue != 0:
-                autoMultiplier = 1 / max( abs( minValue ), abs( maxValue ) )
-            normValues = [ autoMultiplier * item for item in normValues ]
+                multiplier /= max( abs( minValue ), abs( maxValue ) )
 
-        normValues = [ self._scaleMultiplier * item for item in normValues ]
-
-        return normValues
+        return normValues * multiplier
 
     @staticmethod
-    def _normalizedValuesToRegisterValues( normValues: [float] ) -> [float]:
+    def _normalizedValuesToRegisterValues( normValues: [float] ) -> np.ndarray:
         """Given values normalized to -1.0 to 1.0, convert them to correct SRAM register values.
-        """
-        registerValues = []
 
-        for normValue in normValues:
-            registerValue = int( round( (normValue + 1.0) *
-                                        AWG_AD9106.MAX_SRAM_VALUE / 2.0, 0 ) )
-            registerValue = max( 0, min( AWG_AD9106.MAX_SRAM_VALUE, registerValue ) )
-            registerValues.append( registerValue )
+        Accepts either a list or a numpy array, returns an int16 numpy array
+        that convertNumbersToZCommands() consumes without re-quantizing.
+        """
+        registerValues = np.rint( ( np.asarray( normValues, dtype = float ) + 1.0 ) *
+                                  AWG_AD9106.MAX_SRAM_VALUE / 2.0 )
+        registerValues = np.clip( registerValues, 0, AWG_AD9106.MAX_SRAM_VALUE )
 
-        return registerValues
+        return registerValues.astype( np.int16 )
 
     def _padRowsToWrite(self,
                         valuesToPad: [float] ) -> [float]:
         """If the input valuesToPad is too short, repeat the final value until long enough.
         
         "Long enough" means to make the list as long as _maxRowsToWrite.
+        Accepts either a list or a numpy array.
         """
-        if len(valuesToPad) < self._maxRowsToWrite:
-            padValue = 0.0 if len(valuesToPad) == 0 else valuesToPad[len(valuesToPad) - 1]
-            for _ in range(len(valuesToPad), self._maxRowsToWrite):
-                valuesToPad.append( padValue )
+        deficit = self._maxRowsToWrite - len(valuesToPad)
+        if deficit <= 0:
+            return valuesToPad
+
+        if isinstance( valuesToPad, np.ndarray ):
+            if len(valuesToPad) == 0:
+                return np.zeros( self._maxRowsToWrite )
+            return np.pad( valuesToPad, ( 0, deficit ), mode = 'edge' )
+
+        padValue = 0.0 if len(valuesToPad) == 0 else valuesToPad[-1]
+        valuesToPad.extend( [ padValue ] * deficit )
 
         return valuesToPad
 
@@ -728,6 +1039,13 @@ def _parse_command_line():
                         nargs=3,
                         default=[],
                         action='append')
+    parser.add_argument('--await-ack',
+                        help="(advanced feature) Instead of pausing a fixed delay after each "
+                             "command, wait only until the device responds to it.  This greatly "
+                             "speeds up long command lists and SRAM loads, but requires firmware "
+                             "that responds to every command.",
+                        default=False,
+                        action='store_true')
     parser.add_argument('--no-messages',
                         help="Disables writing message to the screen.  Separate from "
                              "--display-commands.",
@@ -749,19 +1067,18 @@ def _parse_command_line():
     args.csv_header = AWG_AD9106.AUTO_DETECT if args.csv_header is None else args.csv_header
 
     if len(args.column_range) > 0:
-        column_ranges = []
-
-        max_index = -1
+        # Validate and collect the ranges in a single pass, keyed by column
+        # index; the sparse list the load code expects is only materialized
+        # once, after the highest index is known.
+        ranges_by_index = {}
         for column_range in args.column_range:
             if column_range[0] < 0:
                 print( 'ERROR: a --column-range with a negative index was given' )
                 sys.exit(1)
-            max_index = max( int( column_range[0] ), max_index )
+            ranges_by_index[ int( column_range[0] ) ] = column_range[1:]
 
-        column_ranges = [ None ] * (max_index + 1)
-        for column_range in args.column_range:
-            index = int( column_range[0] )
-            column_range = column_range[1:]
+        column_ranges = [ None ] * ( max( ranges_by_index ) + 1 )
+        for index, column_range in ranges_by_index.items():
             column_ranges[index] = column_range
 
         args.column_range = column_ranges
@@ -772,18 +1089,27 @@ def _parse_command_line():
 def _execute_commands_list( device: serial.Serial,
                             commands: [str] ) -> None:
     """Executes the list of commands (or file of commands) sent by the main function.
+
+    All the commands, including the contents of any referenced command files,
+    are gathered into a single write() call so the device layer can batch
+    them.  Command files are read whole since a command must never be split
+    across two writes.
     """
+    gathered = []
     for command in commands:
         if len(command) == 0:
             continue
 
         if command[0] != '@':
-            device.write( command )
+            gathered.append( command )
             continue
 
         filename = command[1:]
         with open( filename, 'rb' ) as file:
-            device.write( file.read() )
+            gathered.append( file.read() )
+
+    if len(gathered) > 0:
+        device.write( gathered )
 
 
 def _main():
@@ -792,25 +1118,30 @@ def _main():
     args = _parse_command_line()
 
     if args.list_ports:
-        print("Available serial ports (AWG AD9106 has USB VID & PID of 0x0483 & 0x5740):" )
-        for port in serial.tools.list_ports.comports( True ):
-            print(  '   Serial device:')
-            print( f'      Device        : {port.device}')
-            print( f'      Name          : {port.name}')
-            print( f'      Description   : {port.description}')
-            print( f'      Hardware ID   : {port.hwid}')
-            print(  '      USB specific:' )
-            print( f'      VID           : 0x{port.vid:04X}')
-            print( f'      PID           : 0x{port.pid:04X}')
-            print( f'      Serial Number : {port.serial_number}')
-            print( f'      Location      : {port.location}')
-            print( f'      Manufacturer  : {port.manufacturer}')
-            print( f'      Product       : {port.product}')
-            print( f'      Interface     : {port.interface}')
-        if len( serial.tools.list_ports.comports( True ) ) == 0:
-            print('   None found' )
-
-    device = AWG_AD9106( args.port, args.out_file is not None, args.display_commands )
+        # Enumerate the ports once; on some platforms each comports() call
+        # walks the system device tree and takes hundreds of milliseconds.
+        ports = serial.tools.list_ports.comports( True )
+        output = ["Available serial ports (AWG AD9106 has USB VID & PID of 0x0483 & 0x5740):"]
+        for port in ports:
+            output.append(  '   Serial device:')
+            output.append( f'      Device        : {port.device}')
+            output.append( f'      Name          : {port.name}')
+            output.append( f'      Description   : {port.description}')
+            output.append( f'      Hardware ID   : {port.hwid}')
+            output.append(  '      USB specific:' )
+            output.append( f'      VID           : 0x{port.vid:04X}')
+            output.append( f'      PID           : 0x{port.pid:04X}')
+            output.append( f'      Serial Number : {port.serial_number}')
+            output.append( f'      Location      : {port.location}')
+            output.append( f'      Manufacturer  : {port.manufacturer}')
+            output.append( f'      Product       : {port.product}')
+            output.append( f'      Interface     : {port.interface}')
+        if len( ports ) == 0:
+            output.append('   None found' )
+        print( '\n'.join( output ) )
+
+    device = AWG_AD9106( args.port, args.out_file is not None, args.display_commands,
+                         awaitAck = args.await_ack )
 
     device.setLoadParameters( columnRanges = args.column_range,
                               columnSelected = args.column_selected,